@@ -1,4 +1,4 @@
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, g, send_from_directory
 from flask_cors import CORS
 import joblib
 import pandas as pd
@@ -6,6 +6,11 @@ import json
 import numpy as np
 from datetime import datetime
 import os
+import io
+import hmac
+import time
+import cProfile
+import pstats
 from meal_plans import MEAL_PLANS, get_rule_based_plan, train_model
 
 app = Flask(__name__)
@@ -18,6 +23,14 @@ CORS(app, resources={
 SUBMISSIONS_FILE = 'submissions.json'
 MODEL_DIR = 'model'
 
+# Profiling (disabled unless a token or sample rate is configured)
+PROFILE_DIR = os.environ.get('PROFILE_DIR', 'profiles')
+PROFILE_SAMPLE_RATE = float(os.environ.get('PROFILE_SAMPLE_RATE', 0))
+PROFILE_MAX_FILES = int(os.environ.get('PROFILE_MAX_FILES', 50))
+PROFILE_ADMIN_TOKEN = os.environ.get('PROFILE_ADMIN_TOKEN', '')
+PROFILE_HEADER = 'X-Profile'
+PROFILED_ENDPOINTS = {'generate_nutrition_plan', 'handle_plan_selection'}
+
 # Configure numpy random generator
 from numpy.random import Generator, MT19937
 rng = Generator(MT19937(12345))
@@ -42,6 +55,57 @@ def store_submission(data):
     except Exception as e:
         app.logger.error(f"Submission storage error: {str(e)}")
 
+def token_matches(value):
+    """Constant-time comparison against the profiling admin token"""
+    if not PROFILE_ADMIN_TOKEN or not value:
+        return False
+    return hmac.compare_digest(value.encode(), PROFILE_ADMIN_TOKEN.encode())
+
+def rotate_profiles():
+    """Keep only the newest PROFILE_MAX_FILES profile dumps"""
+    dumps = sorted(f for f in os.listdir(PROFILE_DIR) if f.endswith('.prof'))
+    for name in dumps[:max(len(dumps) - PROFILE_MAX_FILES, 0)]:
+        try:
+            os.remove(os.path.join(PROFILE_DIR, name))
+        except OSError:
+            pass
+
+@app.before_request
+def start_request_profile():
+    """Start cProfile for sampled or header-flagged /plan and /selection requests"""
+    if not (PROFILE_SAMPLE_RATE or PROFILE_ADMIN_TOKEN):
+        return
+    if request.endpoint not in PROFILED_ENDPOINTS:
+        return
+        
+    forced = token_matches(request.headers.get(PROFILE_HEADER))
+    if forced or (PROFILE_SAMPLE_RATE and rng.random() < PROFILE_SAMPLE_RATE):
+        g.profile_start = time.perf_counter()
+        g.profiler = cProfile.Profile()
+        g.profiler.enable()
+
+@app.teardown_request
+def stop_request_profile(exc):
+    """Stop an active request profile and dump it to PROFILE_DIR"""
+    profiler = g.pop('profiler', None)
+    if profiler is None:
+        return
+    profiler.disable()
+    
+    try:
+        elapsed_ms = int((time.perf_counter() - g.pop('profile_start')) * 1000)
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        name = "{}_{}_{}_{}ms.prof".format(
+            datetime.now().strftime('%Y%m%dT%H%M%S%f'),
+            os.getpid(),
+            request.endpoint,
+            elapsed_ms
+        )
+        profiler.dump_stats(os.path.join(PROFILE_DIR, name))
+        rotate_profiles()
+    except Exception as e:
+        app.logger.error(f"Profile dump failed: {str(e)}")
+
 def load_model():
     """Load current model and encoder with numpy compatibility fix"""
     try:
@@ -135,6 +199,42 @@ def health_check():
         "sklearn_version": joblib.__version__
     })
 
+@app.route('/admin/profiles', methods=['GET'])
+def list_profiles():
+    """List captured request profiles, newest first"""
+    if not token_matches(request.headers.get('X-Admin-Token')):
+        return jsonify({"success": False, "error": "Unauthorized"}), 403
+        
+    if not os.path.isdir(PROFILE_DIR):
+        return jsonify({"success": True, "profiles": []})
+        
+    profiles = [{
+        "name": name,
+        "size": os.path.getsize(os.path.join(PROFILE_DIR, name))
+    } for name in sorted(os.listdir(PROFILE_DIR), reverse=True) if name.endswith('.prof')]
+    
+    return jsonify({"success": True, "profiles": profiles})
+
+@app.route('/admin/profiles/<name>', methods=['GET'])
+def get_profile(name):
+    """Serve a captured profile as a raw pstats dump or a text summary (?format=text)"""
+    if not token_matches(request.headers.get('X-Admin-Token')):
+        return jsonify({"success": False, "error": "Unauthorized"}), 403
+        
+    if not name.endswith('.prof') or not os.path.isdir(PROFILE_DIR) or name not in os.listdir(PROFILE_DIR):
+        return jsonify({"success": False, "error": "Profile not found"}), 404
+        
+    if request.args.get('format') == 'text':
+        try:
+            stream = io.StringIO()
+            stats = pstats.Stats(os.path.join(PROFILE_DIR, name), stream=stream)
+            stats.sort_stats(request.args.get('sort', 'cumulative')).print_stats(int(request.args.get('limit', 50)))
+            return stream.getvalue(), 200, {'Content-Type': 'text/plain; charset=utf-8'}
+        except (KeyError, ValueError) as e:
+            return jsonify({"success": False, "error": f"Invalid profile query: {str(e)}"}), 400
+        
+    return send_from_directory(os.path.abspath(PROFILE_DIR), name, as_attachment=True)
+
 def initialize_system():
     """Initialize application components"""
     os.makedirs(MODEL_DIR, exist_ok=True)
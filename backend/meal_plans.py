@@ -1,4 +1,8 @@
 import os
+import time
+import argparse
+import tracemalloc
+from contextlib import contextmanager
 import pandas as pd
 import numpy as np
 import joblib
@@ -405,29 +409,68 @@ def load_user_submissions() -> pd.DataFrame:
     except Exception as e:
         return pd.DataFrame()
 
-def create_dataset() -> pd.DataFrame:
+@contextmanager
+def profile_phase(name: str, report: list = None):
+    """Record wall time and tracemalloc allocations for a training phase"""
+    if report is None:
+        yield
+        return
+
+    tracemalloc.reset_peak()
+    start_mem = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        end_mem, peak_mem = tracemalloc.get_traced_memory()
+        report.append({
+            'phase': name,
+            'seconds': elapsed,
+            'alloc_kb': (end_mem - start_mem) / 1024,
+            'peak_kb': (peak_mem - start_mem) / 1024
+        })
+
+def print_profile_report(report: list) -> None:
+    """Print per-phase training profile"""
+    print("\nTraining Profile:")
+    print(f"{'phase':<22}{'wall (s)':>10}{'net alloc (KiB)':>18}{'peak (KiB)':>14}")
+    for row in report:
+        print(f"{row['phase']:<22}{row['seconds']:>10.3f}"
+              f"{row['alloc_kb']:>18.1f}{row['peak_kb']:>14.1f}")
+    print(f"{'total':<22}{sum(r['seconds'] for r in report):>10.3f}")
+
+def create_dataset(report: list = None) -> pd.DataFrame:
     """Combine synthetic and real data"""
-    synthetic = create_synthetic_data()
-    real = load_user_submissions()
+    with profile_phase('synthetic_generation', report):
+        synthetic = create_synthetic_data()
+    with profile_phase('submission_loading', report):
+        real = load_user_submissions()
     return pd.concat([synthetic, real], ignore_index=True)
 
-def train_model() -> None:
+def train_model(profile: bool = False) -> None:
     """Train and optimize the recommendation model"""
+    report = [] if profile else None
+    started_tracing = profile and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+
     try:
         os.makedirs('model', exist_ok=True)
-        df = create_dataset()
-        
-        # Feature engineering
-        df['diet_goal'] = df['diet'] + "_" + df['goal']
+        df = create_dataset(report)
         
-        # Advanced encoding
-        encoder = OneHotEncoder(
-            handle_unknown='infrequent_if_exist',
-            max_categories=50,
-            sparse_output=False
-        )
-        
-        encoded_features = encoder.fit_transform(df[['diet', 'goal', 'diet_goal']])
+        with profile_phase('encoding', report):
+            # Feature engineering
+            df['diet_goal'] = df['diet'] + "_" + df['goal']
+            
+            # Advanced encoding
+            encoder = OneHotEncoder(
+                handle_unknown='infrequent_if_exist',
+                max_categories=50,
+                sparse_output=False
+            )
+            
+            encoded_features = encoder.fit_transform(df[['diet', 'goal', 'diet_goal']])
         
         # Optimized model parameters
         model = GradientBoostingClassifier(
@@ -441,27 +484,36 @@ def train_model() -> None:
             n_iter_no_change=10
         )
         
-        # Train/validation split
-        X_train, X_val, y_train, y_val = train_test_split(
-            encoded_features, df['selected_plan_id'],
-            test_size=0.2,
-            stratify=df['selected_plan_id']
-        )
-        
-        model.fit(X_train, y_train)
+        with profile_phase('fitting', report):
+            # Train/validation split
+            X_train, X_val, y_train, y_val = train_test_split(
+                encoded_features, df['selected_plan_id'],
+                test_size=0.2,
+                stratify=df['selected_plan_id']
+            )
+            
+            model.fit(X_train, y_train)
         
-        # Model evaluation
-        print("\nModel Validation Report:")
-        print(classification_report(y_val, model.predict(X_val)))
+        with profile_phase('evaluation', report):
+            # Model evaluation
+            print("\nModel Validation Report:")
+            print(classification_report(y_val, model.predict(X_val)))
         
-        # Save artifacts
-        joblib.dump(model, 'model/nutrition_model.pkl')
-        joblib.dump(encoder, 'model/feature_encoder.pkl')
+        with profile_phase('artifact_dumping', report):
+            # Save artifacts
+            joblib.dump(model, 'model/nutrition_model.pkl')
+            joblib.dump(encoder, 'model/feature_encoder.pkl')
         print("\n✅ Model successfully trained and saved")
         
+        if report is not None:
+            print_profile_report(report)
+        
     except Exception as e:
         print(f"\n❌ Model training failed: {str(e)}")
         raise
+    finally:
+        if started_tracing:
+            tracemalloc.stop()
 
 def get_rule_based_plan(user_data: dict) -> dict:
     """Advanced rule-based fallback system"""
@@ -500,9 +552,14 @@ def get_rule_based_plan(user_data: dict) -> dict:
         return MEAL_PLANS[0]
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Train the nutrition recommendation model")
+    parser.add_argument('--profile', action='store_true',
+                        help="report per-phase wall time and allocations (tracemalloc)")
+    args = parser.parse_args()
+
     print("🚀 Starting Nutrition Model Training...")
     try:
-        train_model()
+        train_model(profile=args.profile)
         print(" Training completed successfully")
     except Exception as e:
         print(f" Critical training error: {str(e)}")